@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 # 导入自定义模块
-from modules.fund_filter import fund_filter, get_fund_managers, get_fund_companies
+from modules.fund_filter import fund_filter, get_fund_managers, get_fund_companies, get_available_fund_dates
 from modules.stock_filter import stock_filter, get_stock_type_options, get_sub_type_options, get_industry_options, search_stock
 from modules.utils import (
     load_css, format_number, user_auth, save_user_preferences,
@@ -167,7 +167,7 @@ st.session_state.current_page = page
 if st.session_state.current_page == "🏠 首页":
     # 首页内容
     st.title(f"🎯 {APP_TITLE}")
-    st.markdown("---")
+    st.divider()
     
     col1, col2 = st.columns(2)
     
@@ -208,7 +208,7 @@ if st.session_state.current_page == "🏠 首页":
         - **综合过滤功能**
         """)
     
-    st.markdown("---")
+    st.divider()
     
     # 高级功能介绍
     if st.session_state.user_logged_in:
@@ -239,7 +239,7 @@ if st.session_state.current_page == "🏠 首页":
     else:
         st.info("👋 登录后可使用更多高级功能，包括经济周期监测和投资组合分析")
     
-    st.markdown("---")
+    st.divider()
     st.markdown("### 📋 系统说明")
     st.markdown(f"""
     本系统基于本地基金和股票数据进行智能筛选分析，支持：
@@ -257,7 +257,6 @@ elif st.session_state.current_page == "📈 基金筛选":
     
     # 数据日期选择
     try:
-        from modules.fund_filter import get_available_fund_dates
         available_dates = get_available_fund_dates()
         if available_dates:
             selected_date = st.sidebar.selectbox(
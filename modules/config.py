@@ -65,6 +65,7 @@ TIME_PERIOD_MAPPING = {
 TABLE_CONFIG = {
     "height": 500,  # 表格高度（像素）
     "row_height": 35,  # 行高（像素）
+    "page_size": 200,  # 每页显示的行数，结果超过该行数时分页显示
     "header_bg_color": "#f0f2f6",  # 表头背景色
     "header_text_color": "#333333",  # 表头文字颜色
     "border_color": "#e0e0e0",  # 边框颜色
@@ -5,11 +5,14 @@
 
 import pandas as pd
 import os
+import logging
 from typing import Dict, List, Set, Optional, Any, Union
 
 from .utils import get_available_dates, get_current_date, safe_read_csv
 from .config import FUND_DATA_PATH
 
+logger = logging.getLogger(__name__)
+
 
 def get_available_fund_dates():
     """
@@ -249,7 +252,7 @@ def get_fund_managers(data_date=None):
                             if m.strip():
                                 managers.add(m.strip())
     except Exception as e:
-        print(f"读取基金经理信息时出错: {e}")
+        logger.warning("读取基金经理信息时出错: %s", e)
     
     return sorted(list(managers))
 
@@ -285,6 +288,6 @@ def get_fund_companies(data_date=None):
                     if isinstance(company, str) and company.strip():
                         companies.add(company.strip())
     except Exception as e:
-        print(f"读取基金公司信息时出错: {e}")
+        logger.warning("读取基金公司信息时出错: %s", e)
     
     return sorted(list(companies))
\ No newline at end of file
@@ -7,8 +7,12 @@ from abc import ABC, abstractmethod
 import pandas as pd
 import os
 import re
+import logging
+from functools import lru_cache
 from typing import Dict, List, Set, Optional, Any, Union
 
+logger = logging.getLogger(__name__)
+
 
 class BaseData(ABC):
     """数据管理基类，定义通用的数据加载和处理方法"""
@@ -73,13 +77,14 @@ class BaseData(ABC):
                 return pd.read_csv(file_path, encoding=encoding)
             return pd.DataFrame()
         except Exception as e:
-            print(f"读取文件 {file_path} 失败: {e}")
+            logger.warning("读取文件 %s 失败: %s", file_path, e)
             return pd.DataFrame()
     
     @staticmethod
+    @lru_cache(maxsize=16384, typed=True)
     def clean_code(code_str: str) -> str:
         """
-        清理并标准化股票代码
+        清理并标准化股票代码，结果按原始值缓存，同一代码在多次逐行提取中只解析一次
         
         Args:
             code_str: 原始股票代码字符串
@@ -119,6 +124,34 @@ class BaseData(ABC):
         
         return ""
     
+    @staticmethod
+    def clean_codes(values: pd.Series) -> pd.Series:
+        """
+        批量清理并标准化股票代码，规则与clean_code一致，按列向量化处理
+        
+        Args:
+            values: 原始股票代码列
+        
+        Returns:
+            pd.Series: 标准化的6位股票代码，无法解析的位置为空字符串
+        """
+        # 缺失值转为字符串后不含数字，最终会得到空字符串
+        code_str = values.astype(str).str.replace("'", "", regex=False).str.strip()
+        
+        # 处理"SH600519.贵州茅台"或"600519.贵州茅台"格式，取点号前的部分
+        has_dot = code_str.str.contains('.', regex=False)
+        code_part = code_str.where(~has_dot, code_str.str.split('.', n=1).str[0])
+        
+        # 处理可能包含逗号的格式，假设第二部分是代码
+        has_comma = ~has_dot & code_str.str.contains(',', regex=False)
+        code_part = code_part.where(~has_comma, code_str.str.split(',').str[1])
+        
+        # 去掉所有非数字字符（包括SH/SZ前缀）
+        clean = code_part.str.replace(r'\D', '', regex=True)
+        
+        # 标准化为6位数字
+        return clean.str.zfill(6).where(clean != '', '')
+    
     @staticmethod
     def safe_get_numeric(value: Any, allow_percent: bool = True) -> Optional[float]:
         """
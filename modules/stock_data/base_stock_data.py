@@ -4,12 +4,34 @@
 """
 
 import pandas as pd
+import csv
 import os
 import re
+import sys
+import logging
 from typing import Dict, List, Set, Optional, Any, Union
 from abc import ABC, abstractmethod
 from .base_data import BaseData
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+logger = logging.getLogger(__name__)
+
+# 代码列和行业列的候选列名，按优先级排列
+_CODE_COLUMNS = ['代码', '股票代码', 'code', 'stock_code', '股票', '序']
+_INDUSTRY_COLUMNS = ['行业', '所属行业', '申万行业', '行业分类']
+
+# 与pandas.read_csv默认一致的空值标记，pyarrow扫描时使用同一套规则
+_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
 
 class BaseStockData(BaseData):
     """
@@ -49,13 +71,9 @@ class BaseStockData(BaseData):
         if not file_path:
             self._is_loaded = False
             return False
-            
-        if not os.path.exists(file_path):
-            self._is_loaded = False
-            return False
         
         try:
-            # 读取数据文件
+            # 读取数据文件，文件不存在时返回空数据帧
             if file_path.endswith('.txt'):
                 df = self._read_csv_file(file_path, sep='\t')
             else:
@@ -86,6 +104,67 @@ class BaseStockData(BaseData):
             self._is_loaded = False
             return False
     
+    def scan_industries(self, encoding: str = 'utf-8') -> Optional[Set[str]]:
+        """
+        只读取代码列和行业列获取行业集合，无需完整加载数据
+        结果与load()后stock_info中的行业一致：每个有效代码取第一个非空行业
+        
+        Args:
+            encoding: 文件编码，默认为utf-8
+            
+        Returns:
+            Set[str]: 行业集合，文件中没有行业列时为空集合；
+                      文件不存在、没有数据行或无法用pyarrow读取时返回None
+        """
+        file_path = self._determine_file_path()
+        if pacsv is None or not file_path or not os.path.exists(file_path):
+            return None
+        
+        sep = '\t' if file_path.endswith('.txt') else ','
+        try:
+            # 先读表头确定要读取的列，列的选择规则与load()一致
+            header_encoding = 'utf-8-sig' if encoding.lower() in ('utf-8', 'utf8') else encoding
+            with open(file_path, 'r', encoding=header_encoding, newline='') as f:
+                header = next(csv.reader(f, delimiter=sep), [])
+            names = [name.strip() for name in header]
+            if not names:
+                return None
+            
+            code_name = next((col for col in _CODE_COLUMNS if col in names), names[0])
+            industry_name = next((col for col in _INDUSTRY_COLUMNS if col in names), None)
+            columns = [header[names.index(code_name)]]
+            if industry_name is not None:
+                columns.append(header[names.index(industry_name)])
+            
+            # 只解析这一两列，全部按字符串读取，代码的前导零由clean_codes统一补齐
+            table = pacsv.read_csv(
+                file_path,
+                read_options=pacsv.ReadOptions(encoding=encoding),
+                parse_options=pacsv.ParseOptions(delimiter=sep),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=columns,
+                    column_types={col: pa.string() for col in columns},
+                    null_values=_NA_VALUES,
+                    strings_can_be_null=True
+                )
+            )
+        except (ValueError, pa.ArrowException) as e:
+            # 编码异常、列名重复等情况交给调用方回退到完整加载
+            logger.info("扫描行业失败，回退到完整加载 %s: %s", file_path, e)
+            return None
+        
+        if table.num_rows == 0:
+            return None
+        if industry_name is None:
+            return set()
+        
+        codes = self.clean_codes(pd.Series(table.column(0).to_pylist(), dtype=object))
+        industries = pd.Series(table.column(1).to_pylist(), dtype=object)
+        valid = (codes != '') & industries.notna()
+        scanned = pd.DataFrame({'code': codes[valid], 'industry': industries[valid].str.strip()})
+        scanned = scanned[scanned['industry'] != ''].drop_duplicates('code')
+        return set(scanned['industry'])
+    
     def _find_code_column(self, df: pd.DataFrame) -> Optional[str]:
         """
         查找股票代码列
@@ -96,9 +175,7 @@ class BaseStockData(BaseData):
         Returns:
             str: 代码列名，如果找不到则返回None
         """
-        code_columns = ['代码', '股票代码', 'code', 'stock_code', '股票', '序']
-        
-        for col in code_columns:
+        for col in _CODE_COLUMNS:
             if col in df.columns:
                 return col
         
@@ -116,12 +193,8 @@ class BaseStockData(BaseData):
             df: 数据帧
             code_column: 代码列名
         """
-        self.stock_codes = set()
-        
-        for value in df[code_column]:
-            code = self.clean_code(value)
-            if code:
-                self.stock_codes.add(code)
+        codes = self.clean_codes(df[code_column])
+        self.stock_codes = set(codes[codes != ''])
     
     def _extract_stock_info(self, df: pd.DataFrame, code_column: str) -> None:
         """
@@ -136,8 +209,7 @@ class BaseStockData(BaseData):
         name_column = next((col for col in name_columns if col in df.columns), None)
         
         # 查找行业列
-        industry_columns = ['行业', '所属行业', '申万行业', '行业分类']
-        industry_column = next((col for col in industry_columns if col in df.columns), None)
+        industry_column = next((col for col in _INDUSTRY_COLUMNS if col in df.columns), None)
         
         # 查找常见财务指标列
         financial_columns = {
@@ -148,16 +220,24 @@ class BaseStockData(BaseData):
             '今年来': ['今年来', '今年涨幅', '年初至今']
         }
         
-        # 实际数据帧中的列映射
-        column_mapping = {}
+        # 实际数据帧中的列映射，列是否存在只在循环前判断一次
+        present_mapping = {}
         for std_col, possible_cols in financial_columns.items():
             for col in possible_cols:
                 if col in df.columns:
-                    column_mapping[col] = std_col
+                    present_mapping[col] = std_col
                     break
         
+        has_name = name_column is not None
+        has_industry = industry_column is not None
+        
+        # 逐行处理时只展开用到的列，转为object避免行内数值类型被统一提升
+        used_columns = list(dict.fromkeys(
+            [code_column] + [col for col in (name_column, industry_column) if col] + list(present_mapping)
+        ))
+        
         # 提取每行数据
-        for _, row in df.iterrows():
+        for _, row in df[used_columns].astype(object).iterrows():
             try:
                 code = self.clean_code(row[code_column])
                 if not code:
@@ -168,7 +248,7 @@ class BaseStockData(BaseData):
                     self.stock_info[code] = {}
                 
                 # 提取名称
-                if name_column and pd.notna(row.get(name_column)):
+                if has_name and pd.notna(row[name_column]):
                     if '.' in str(row[code_column]):
                         # 如果代码列中包含名称（格式为"代码.名称"）
                         parts = str(row[code_column]).split('.')
@@ -179,14 +259,14 @@ class BaseStockData(BaseData):
                     elif not self.stock_info[code].get('名称') or not self.stock_info[code]['名称']:
                         self.stock_info[code]['名称'] = str(row[name_column]).strip()
                 
-                # 提取行业
-                if industry_column and pd.notna(row.get(industry_column)):
+                # 提取行业，行业名称取值有限，驻留后各股票共享同一字符串对象
+                if has_industry and pd.notna(row[industry_column]):
                     if not self.stock_info[code].get('行业') or not self.stock_info[code]['行业']:
-                        self.stock_info[code]['行业'] = str(row[industry_column]).strip()
+                        self.stock_info[code]['行业'] = sys.intern(str(row[industry_column]).strip())
                 
                 # 提取财务指标
-                for orig_col, std_col in column_mapping.items():
-                    if pd.notna(row.get(orig_col)) and (not self.stock_info[code].get(std_col) or not self.stock_info[code][std_col]):
+                for orig_col, std_col in present_mapping.items():
+                    if pd.notna(row[orig_col]) and (not self.stock_info[code].get(std_col) or not self.stock_info[code][std_col]):
                         self.stock_info[code][std_col] = str(row[orig_col]).strip()
             except Exception:
                 pass
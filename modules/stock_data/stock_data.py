@@ -6,9 +6,13 @@
 import pandas as pd
 import os
 import re
+import sys
+import logging
 from typing import Dict, List, Set, Optional, Any, Union, Tuple
 from .base_data import BaseData
 
+logger = logging.getLogger(__name__)
+
 
 class StockData(BaseData):
     """股票数据类，处理特定类型股票数据的加载和筛选"""
@@ -77,8 +81,7 @@ class StockData(BaseData):
                             os.path.dirname(os.path.dirname(self.data_dir)), 
                             self.config['file_pattern'].format(sub_type_value)
                         )
-                    print(f"非日期依赖文件路径: {file_path}")
-                    print(f"文件是否存在: {os.path.exists(file_path)}")
+                    logger.debug("非日期依赖文件路径: %s", file_path)
                     return file_path
                 else:
                     # 依赖日期目录
@@ -94,16 +97,15 @@ class StockData(BaseData):
         Returns:
             bool: 加载是否成功
         """
-        print(f"开始加载数据: {self.stock_type}, 子类型: {self.sub_type}")
-        print(f"文件路径: {self.file_path}")
+        logger.debug("开始加载数据: %s, 子类型: %s, 文件路径: %s", self.stock_type, self.sub_type, self.file_path)
         
         if not self.file_path:
-            print("文件路径为空")
+            logger.debug("文件路径为空: %s, 子类型: %s", self.stock_type, self.sub_type)
             self._is_loaded = False
             return False
             
         if not os.path.exists(self.file_path):
-            print(f"文件不存在: {self.file_path}")
+            logger.debug("文件不存在: %s", self.file_path)
             self._is_loaded = False
             return False
         
@@ -173,13 +175,9 @@ class StockData(BaseData):
             df: 数据帧
             code_column: 代码列名
         """
-        self.stock_codes = set()
-        
-        # 遍历代码列，处理每个代码
-        for value in df[code_column]:
-            code = self.clean_code(value)
-            if code:
-                self.stock_codes.add(code)
+        # 按列批量清理代码，去掉无法解析的空代码
+        codes = self.clean_codes(df[code_column])
+        self.stock_codes = set(codes[codes != ''])
     
     def _extract_stock_info(self, df: pd.DataFrame, code_column: str) -> None:
         """
@@ -216,16 +214,24 @@ class StockData(BaseData):
             '今年来': ['今年来', '今年涨幅', '年初至今']
         }
         
-        # 实际数据帧中的列映射
-        column_mapping = {}
+        # 实际数据帧中的列映射，列是否存在只在循环前判断一次
+        present_mapping = {}
         for std_col, possible_cols in financial_columns.items():
             for col in possible_cols:
                 if col in df.columns:
-                    column_mapping[col] = std_col
+                    present_mapping[col] = std_col
                     break
         
+        has_name = name_column is not None
+        has_industry = industry_column is not None
+        
+        # 逐行处理时只展开用到的列，转为object避免行内数值类型被统一提升
+        used_columns = list(dict.fromkeys(
+            [code_column] + [col for col in (name_column, industry_column) if col] + list(present_mapping)
+        ))
+        
         # 提取每行数据
-        for _, row in df.iterrows():
+        for _, row in df[used_columns].astype(object).iterrows():
             try:
                 # 获取股票代码
                 code = self.clean_code(row[code_column])
@@ -237,7 +243,7 @@ class StockData(BaseData):
                     self.stock_info[code] = {}
                 
                 # 提取名称
-                if name_column and pd.notna(row.get(name_column)):
+                if has_name and pd.notna(row[name_column]):
                     if '.' in str(row[code_column]):
                         # 如果代码列中包含名称（格式为"代码.名称"）
                         parts = str(row[code_column]).split('.')
@@ -248,14 +254,14 @@ class StockData(BaseData):
                     elif not self.stock_info[code].get('名称') or not self.stock_info[code]['名称']:
                         self.stock_info[code]['名称'] = str(row[name_column]).strip()
                 
-                # 提取行业
-                if industry_column and pd.notna(row.get(industry_column)):
+                # 提取行业，行业名称取值有限，驻留后各股票共享同一字符串对象
+                if has_industry and pd.notna(row[industry_column]):
                     if not self.stock_info[code].get('行业') or not self.stock_info[code]['行业']:
-                        self.stock_info[code]['行业'] = str(row[industry_column]).strip()
+                        self.stock_info[code]['行业'] = sys.intern(str(row[industry_column]).strip())
                 
                 # 提取财务指标
-                for orig_col, std_col in column_mapping.items():
-                    if pd.notna(row.get(orig_col)) and (not self.stock_info[code].get(std_col) or not self.stock_info[code][std_col]):
+                for orig_col, std_col in present_mapping.items():
+                    if pd.notna(row[orig_col]) and (not self.stock_info[code].get(std_col) or not self.stock_info[code][std_col]):
                         self.stock_info[code][std_col] = str(row[orig_col]).strip()
             except Exception:
                 pass
@@ -4,6 +4,7 @@
 """
 
 import os
+import logging
 from typing import Dict, Optional, Any, List
 from .base_stock_data import BaseStockData
 from .stock_data_types import (
@@ -22,6 +23,8 @@ from .stock_data_types import (
     DiscountedCashFlowRankingStockData
 )
 
+logger = logging.getLogger(__name__)
+
 
 class StockDataFactory:
     """股票数据工厂类，负责创建和管理不同类型的股票数据实例"""
@@ -131,7 +134,7 @@ class StockDataFactory:
             BaseStockData: 股票数据实例，如果类型不支持则返回None
         """
         if stock_type not in cls.STOCK_DATA_TYPES:
-            print(f"不支持的股票类型: {stock_type}")
+            logger.warning("不支持的股票类型: %s", stock_type)
             return None
         
         # 确定数据目录
@@ -5,6 +5,7 @@
 
 import pandas as pd
 import os
+import sys
 import pickle
 from typing import Dict, List, Set, Optional, Any, Tuple
 from datetime import datetime
@@ -153,40 +154,42 @@ class StockDataManager:
         """
         cache_file = self._get_cache_file_path(instance_key)
         
-        if os.path.exists(cache_file):
-            try:
-                # 检查缓存文件是否是当天创建的
-                file_mtime = os.path.getmtime(cache_file)
-                file_date = datetime.fromtimestamp(file_mtime).date()
-                today = datetime.now().date()
-                
-                # 如果缓存文件不是当天创建的，则认为过期
-                if file_date != today:
-                    return False
-                
-                # 从缓存文件加载数据
-                with open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
-                
-                # 更新内存中的数据
-                self.stock_data_instances[instance_key] = cached_data
-                self.filtered_codes[instance_key] = cached_data.stock_codes
-                self._update_all_stock_info(cached_data)
-                
-                # 如果是特定股票类型，记录
-                stock_type = instance_key.split('_')[0] if '_' in instance_key else instance_key
-                self._loaded_types.add(stock_type)
-                
-                return True
-            except Exception:
-                # 如果加载失败，删除可能损坏的缓存文件
-                try:
-                    os.remove(cache_file)
-                except:
-                    pass
-                return False
+        # 一次stat同时判断缓存是否存在并取得修改时间
+        try:
+            file_mtime = os.stat(cache_file).st_mtime
+        except OSError:
+            return False
         
-        return False
+        try:
+            # 检查缓存文件是否是当天创建的
+            file_date = datetime.fromtimestamp(file_mtime).date()
+            today = datetime.now().date()
+            
+            # 如果缓存文件不是当天创建的，则认为过期
+            if file_date != today:
+                return False
+            
+            # 从缓存文件加载数据
+            with open(cache_file, 'rb') as f:
+                cached_data = pickle.load(f)
+            
+            # 更新内存中的数据
+            self.stock_data_instances[instance_key] = cached_data
+            self.filtered_codes[instance_key] = cached_data.stock_codes
+            self._update_all_stock_info(cached_data)
+            
+            # 如果是特定股票类型，记录
+            stock_type = instance_key.split('_')[0] if '_' in instance_key else instance_key
+            self._loaded_types.add(stock_type)
+            
+            return True
+        except Exception:
+            # 如果加载失败，删除可能损坏的缓存文件
+            try:
+                os.remove(cache_file)
+            except:
+                pass
+            return False
     
     def _save_to_cache(self, instance_key: str, stock_data: BaseStockData) -> bool:
         """
@@ -232,7 +235,7 @@ class StockDataManager:
                 self.all_stock_info[code]['名称'] = info['名称']
             
             if '行业' in info and info['行业'] and (not self.all_stock_info[code].get('行业')):
-                self.all_stock_info[code]['行业'] = info['行业']
+                self.all_stock_info[code]['行业'] = sys.intern(info['行业'])
             
             # 更新其他财务指标
             for key, value in info.items():
@@ -273,7 +276,7 @@ class StockDataManager:
             if stock_info:
                 for info in stock_info.values():
                     if '行业' in info and info['行业']:
-                        industries.add(info['行业'])
+                        industries.add(sys.intern(info['行业']))
         
         # 转换为排序列表
         industry_list = sorted(list(industries))
@@ -4,13 +4,21 @@
 """
 
 import pandas as pd
-from typing import Dict, List, Set, Optional, Any, Union
+from typing import Dict, List, Set, Optional, Any, Union, Tuple
 
 from .stock_data.stock_data_manager import StockDataManager
 from .stock_data.stock_data_factory import StockDataFactory
 from .utils import get_available_dates, get_current_date
 
 
+# 股票类型及子类型选项在运行期间不变，导入时生成一次供界面重复使用
+_STOCK_TYPE_OPTIONS = tuple(StockDataFactory.get_all_stock_types())
+_SUB_TYPE_OPTIONS = {
+    stock_type: tuple(StockDataFactory.get_sub_types(stock_type))
+    for stock_type in _STOCK_TYPE_OPTIONS
+}
+
+
 def stock_filter(selected_types=None, sub_types=None, industry_filter=None, 
                 selected_date=None, roe_filter=None, dividend_filter=None):
     """
@@ -153,17 +161,17 @@ def search_stock(search_term: str, selected_date: Optional[str] = None) -> Dict[
     }
 
 
-def get_stock_type_options() -> List[str]:
+def get_stock_type_options() -> Tuple[str, ...]:
     """
     获取股票类型选项
     
     Returns:
-        List[str]: 可用的股票类型列表
+        Tuple[str, ...]: 可用的股票类型（只读）
     """
-    return StockDataFactory.get_all_stock_types()
+    return _STOCK_TYPE_OPTIONS
 
 
-def get_sub_type_options(stock_type: str) -> List[str]:
+def get_sub_type_options(stock_type: str) -> Tuple[str, ...]:
     """
     获取指定股票类型的子类型选项
     
@@ -171,9 +179,9 @@ def get_sub_type_options(stock_type: str) -> List[str]:
         stock_type: 股票类型名称
         
     Returns:
-        List[str]: 子类型选项列表
+        Tuple[str, ...]: 子类型选项（只读），没有子类型时为空
     """
-    return StockDataFactory.get_sub_types(stock_type)
+    return _SUB_TYPE_OPTIONS.get(stock_type, ())
 
 
 def get_industry_options(selected_date: Optional[str] = None) -> List[str]:
@@ -196,8 +204,15 @@ def get_industry_options(selected_date: Optional[str] = None) -> List[str]:
     # 获取所有股票类型
     stock_types = StockDataFactory.get_all_stock_types()
     
-    # 加载至少一个类型的数据，以获取行业信息
+    # 取第一个有数据的类型的行业信息，优先只扫描代码列和行业列，无法扫描时回退到完整加载
     for stock_type in stock_types:
+        stock_data = StockDataFactory.get_stock_data(
+            stock_type, data_dir=data_manager.data_dir, selected_date=selected_date
+        )
+        industries = stock_data.scan_industries() if stock_data else None
+        if industries is not None:
+            return sorted(industries)
+        
         # 尝试加载数据
         if data_manager.load_stock_data(stock_type):
             break
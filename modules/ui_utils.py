@@ -3,11 +3,131 @@ UI工具模块
 提供UI相关的工具函数，如表格显示、格式化等
 """
 
+import hashlib
+import operator
+import threading
+from datetime import datetime
+from functools import reduce
+from string import Formatter
+from typing import Dict, List, Optional, Any, Tuple, Union
 import streamlit as st
 import pandas as pd
-from typing import Dict, List, Optional, Any, Union
+import numpy as np
 from modules.config import TABLE_CONFIG, COLUMN_WIDTH, EXTERNAL_LINKS, FORMAT_CONFIG
 
+# Streamlit每次控件交互都会重新执行脚本，缓存格式化结果、下载用CSV和表格HTML，数据不变时直接复用
+# 格式化结果是完整的数据帧，只保留少量；HTML和CSV按排序条件、页码各存一份，容量放大
+_FORMAT_CACHE_SIZE = 8
+_RENDER_CACHE_SIZE = 32
+_FORMAT_CACHE: Dict[Any, pd.DataFrame] = {}
+_HTML_CACHE: Dict[Any, str] = {}
+_CSV_CACHE: Dict[Any, bytes] = {}
+# 缓存为模块级共享，多个会话的脚本线程会同时读写，读取和淘汰需加锁
+_CACHE_LOCK = threading.Lock()
+
+# 表格列宽配置（像素），未列出的列使用默认宽度
+_COLUMN_WIDTHS = {
+    '序号': 40,
+    '股票代码': 80,
+    '基金代码': 80,
+    '股票名称': 80,
+    '基金简称': 110,
+    '股息率': 50,
+    '北上持股': 90,
+    '当前ROE': 60,
+    '平均ROE': 60,
+    'PE.扣非': 60,
+    '今年来': 60,
+    '行业': 70
+}
+_DEFAULT_COLUMN_WIDTH = 70
+
+# 原生表格中数值列的显示格式，与format_dataframe中各类列的格式化模板一致
+_NUMBER_FORMATS = {
+    **{col: '%.2f%%' for col in FORMAT_CONFIG["percent_columns"]},
+    **{col: '%.2f亿' for col in FORMAT_CONFIG["money_columns"]},
+    **{col: '%.2f' for col in FORMAT_CONFIG["float_columns"]},
+    **{col: '%d' for col in FORMAT_CONFIG["int_columns"]},
+}
+
+# 表格CSS样式只依赖配置常量，在导入时生成一次，避免每次重新渲染都格式化
+_TABLE_STYLE = f"""
+    <style>
+    /* 移除页面底部留白 */
+    .main .block-container {{
+        padding-bottom: 100rem;
+        max-width: 85%;
+    }}
+    
+    /* 确保表格容器填充可用空间 */
+    .stApp {{
+        height: 100vh;
+    }}
+    
+    .fixed-table {{
+        width: 100%;
+        border-collapse: collapse;
+        table-layout: fixed;
+        font-size: 16px;  /* 减小字体大小 */
+    }}
+    .fixed-table-container {{
+        height: calc(100vh - 200px); /* 动态计算高度，留出页面其他元素的空间 */
+        min-height: {TABLE_CONFIG['height']}px; /* 最小高度保证 */
+        overflow-x: auto;
+        overflow-y: auto;
+        width: 100%;  /* 确保容器宽度占满 */
+    }}
+    .fixed-table thead {{
+        position: sticky;
+        top: 0;
+        background-color: {TABLE_CONFIG['header_bg_color']};
+        z-index: 100;
+    }}
+    .fixed-table th {{
+        padding: 6px 4px;  /* 减小内边距 */
+        text-align: center;
+        font-weight: bold;
+        border-bottom: 2px solid {TABLE_CONFIG['border_color']};
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+        font-size: 16px;  /* 表头字体大小 */
+    }}
+    .fixed-table td {{
+        padding: 3px 4px;  /* 进一步减小单元格内边距 */
+        border-bottom: 1px solid {TABLE_CONFIG['border_color']};
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+        text-align: center;  /* 居中对齐 */
+        height: 28px;  /* 固定行高，使表格更紧凑 */
+        max-height: 32px;
+    }}
+    
+    /* 优化排序控件的布局 */
+    .stSelectbox, .stRadio {{
+        margin-bottom: 0rem;
+    }}
+    
+    /* 减少Streamlit组件的默认间距 */
+    .element-container {{
+        margin-bottom: 0rem;
+    }}
+    .fixed-table a {{
+        color: {TABLE_CONFIG['link_color']};
+        text-decoration: none;
+    }}
+    .fixed-table a:hover {{
+        text-decoration: underline;
+    }}
+    .positive-value {{
+        color: {TABLE_CONFIG['positive_color']};
+    }}
+    .negative-value {{
+        color: {TABLE_CONFIG['negative_color']};
+    }}
+    </style>
+    """
 
 def format_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -19,89 +139,178 @@ def format_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: 格式化后的DataFrame
     """
-    # 创建一个副本以避免修改原始数据
-    result = df.copy()
+    # 创建浅拷贝，下面只整列替换，不会修改原始数据，也无需复制全部数据
+    result = df.copy(deep=False)
+    
+    # 清理数据中的单引号，只处理字符串类型的列（dtype本身总是object的实例，不能用isinstance判断）
+    for col in result.select_dtypes(include=['object', 'string']).columns:
+        values = result[col]
+        try:
+            stripped = values.str.replace("'", "", regex=False)
+        except AttributeError:
+            continue  # 列中没有字符串
+        # 非字符串的单元格经.str处理后为空值，保留原值
+        result[col] = stripped.where(stripped.notna(), values)
     
-    # 清理数据中的单引号
-    for col in result.columns:
-        if isinstance(result[col].dtype, object):  # 只处理字符串类型的列
-            result[col] = result[col].apply(lambda x: str(x).replace("'", "") if isinstance(x, str) else x)
+    # 格式化数值列的同时保留对应的数值，排序时直接使用，无需再解析格式化后的字符串
+    sort_keys = {}
     
     # 格式化百分比列
     for col in FORMAT_CONFIG["percent_columns"]:
         if col in result.columns:
-            result[col] = result[col].apply(format_percent)
+            result[col], sort_keys[col] = _format_numeric_column(result[col], '%.2f%%', keep_marker='%')
     
     # 格式化金额列
     for col in FORMAT_CONFIG["money_columns"]:
         if col in result.columns:
-            result[col] = result[col].apply(format_money)
+            result[col], sort_keys[col] = _format_numeric_column(result[col], '%.2f亿', keep_marker='亿')
     
     # 格式化浮点数列
     for col in FORMAT_CONFIG["float_columns"]:
         if col in result.columns:
-            result[col] = result[col].apply(format_float)
+            result[col], sort_keys[col] = _format_numeric_column(result[col], '%.2f')
     
-    # 格式化整数列
+    # 格式化整数列，%d与int(float(x))一致按截断取整
     for col in FORMAT_CONFIG["int_columns"]:
         if col in result.columns:
-            result[col] = result[col].apply(format_int)
+            result[col], sort_keys[col] = _format_numeric_column(result[col], '%d')
     
-    return result
-
-
-def format_percent(value: Any) -> str:
-    """格式化为百分比"""
-    try:
-        if pd.isna(value) or value == '' or value == '-':
-            return "-"
+    result.attrs['sort_keys'] = sort_keys
+    
+    # 低基数的字符串列（如行业、基金类型）转为category，重复字符串只保存一份
+    return _categorize_low_cardinality(result)
 
-        # 如果已经是百分比格式
-        if isinstance(value, str) and '%' in value:
-            return value
 
-        # 转换为百分比
-        return f"{float(value):.2f}%"
-    except:
-        return str(value)
+def _categorize_low_cardinality(df: pd.DataFrame, threshold: float = 0.5) -> pd.DataFrame:
+    """
+    将取值重复度高的字符串列转为category类型（原地修改）
+    
+    Args:
+        df: 数据帧
+        threshold: 不同取值数与行数之比低于该值的列才转换
+        
+    Returns:
+        pd.DataFrame: 转换后的数据帧
+    """
+    if df.empty or not df.columns.is_unique:
+        return df
+    
+    for col in df.select_dtypes(include='object').columns:
+        values = df[col]
+        # 只处理纯字符串列，混合类型的列转为category后排序结果会变化
+        if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            continue
+        if values.nunique() / len(values) >= threshold:
+            continue
+        # 含百分比的列排序时需要按数值处理，保持字符串类型
+        if values.str.contains('%', regex=False).any():
+            continue
+        df[col] = values.astype('category')
+    
+    return df
 
 
-def format_money(value: Any) -> str:
-    """格式化为金额"""
-    try:
-        if pd.isna(value) or value == '' or value == '-':
-            return "-"
+def _format_numeric_column(values: pd.Series, pattern: str,
+                           keep_marker: Optional[str] = None) -> Tuple[pd.Series, pd.Series]:
+    """
+    整列格式化数值，取代逐个单元格调用格式化函数
+    
+    Args:
+        values: 原始列
+        pattern: printf风格的数值格式模板，如'%.2f%%'
+        keep_marker: 已包含该标记的字符串视为已格式化，保持原样
+        
+    Returns:
+        Tuple[pd.Series, pd.Series]: 格式化后的列，以及用于排序的数值列（无法解析的为NaN）
+    """
+    numbers = pd.to_numeric(values, errors='coerce')
+    result = values.astype(object)
+    
+    # 空值、空字符串和'-'统一显示为'-'，整列只判断一次
+    if values.dtype.kind in 'iuf':
+        # 数值类型的列不会有空字符串或已格式化的字符串，只需判断空值
+        missing = values.isna()
+        formatted = missing
+    else:
+        missing = values.isna() | values.isin(['', '-'])
+        formatted = missing.copy()
+        if keep_marker and values.dtype == object:
+            # 带标记的字符串不可能解析为数值，只需检查解析失败的单元格
+            candidates = numbers.isna() & ~missing
+            if candidates.any():
+                formatted[candidates] = values[candidates].astype(str).str.contains(keep_marker, regex=False)
+    
+    # 与单值格式化一致先转为float，无穷大交给下面逐个转换
+    sort_key = numbers.astype(float)
+    numeric = np.isfinite(sort_key) & ~formatted
+    
+    result[missing] = "-"
+    if numeric.any():
+        result[numeric] = _render_fixed(sort_key[numeric], pattern)
+    
+    # 其余单元格（无穷大、无法解析的字符串等）逐个转换，已确定非空，无需再判断空值
+    rest = ~(formatted | numeric)
+    if rest.any():
+        result[rest] = values[rest].map(lambda value: _numeric_text(value, pattern, keep_marker))
+    
+    # 已带标记的字符串去掉标记后解析为排序用的数值
+    marked = formatted & ~missing
+    if marked.any():
+        sort_key[marked] = pd.to_numeric(
+            values[marked].astype(str).str.replace(keep_marker, '', regex=False), errors='coerce'
+        )
+    
+    return result, sort_key
 
-        # 如果已经包含"亿"
-        if isinstance(value, str) and '亿' in value:
-            return value
 
-        # 转换为金额
-        return f"{float(value):.2f}亿"
-    except:
-        return str(value)
+def _render_fixed(numbers: pd.Series, pattern: str) -> np.ndarray:
+    """按printf风格模板批量格式化数值，先转为Python列表再格式化，省去Series.map的逐元素调度"""
+    return np.array([pattern % value for value in numbers.tolist()], dtype=object)
 
 
-def format_float(value: Any) -> str:
-    """格式化为浮点数"""
+def _numeric_text(value: Any, pattern: str, keep_marker: Optional[str] = None) -> str:
+    """
+    按模板格式化单个非空值
+    
+    Args:
+        value: 要格式化的值
+        pattern: printf风格的数值格式模板
+        keep_marker: 已包含该标记的字符串视为已格式化，保持原样
+        
+    Returns:
+        str: 格式化后的字符串，无法转换为数值时返回原值的字符串形式
+    """
     try:
-        if pd.isna(value) or value == '' or value == '-':
-            return "-"
-
-        return f"{float(value):.2f}"
+        if keep_marker and isinstance(value, str) and keep_marker in value:
+            return value
+        return pattern % float(value)
     except:
         return str(value)
 
 
-def format_int(value: Any) -> str:
-    """格式化为整数"""
-    try:
-        if pd.isna(value) or value == '' or value == '-':
-            return "-"
+def _format_urls(template: str, **fields: pd.Series) -> pd.Series:
+    """
+    按链接模板批量生成URL，逐段拼接整列以代替逐行format
+    
+    Args:
+        template: 链接模板，如EXTERNAL_LINKS中的"https://xueqiu.com/S/{exchange}{code}"
+        **fields: 模板占位符对应的字符串列
+        
+    Returns:
+        pd.Series: 生成的URL列
+    """
+    index = next(iter(fields.values())).index
+    urls = pd.Series('', index=index, dtype=object)
+    for literal, field_name, _, _ in Formatter().parse(template):
+        urls = urls + literal
+        if field_name:
+            urls = urls + fields[field_name]
+    return urls
 
-        return f"{int(float(value))}"
-    except:
-        return str(value)
+
+def _wrap_links(urls: pd.Series, texts: pd.Series) -> pd.Series:
+    """将URL列和显示文本列拼接为<a>标签列"""
+    return '<a href="' + urls + '" target="_blank">' + texts + '</a>'
 
 
 def add_stock_links(df: pd.DataFrame) -> pd.DataFrame:
@@ -117,18 +326,22 @@ def add_stock_links(df: pd.DataFrame) -> pd.DataFrame:
     if '股票代码' not in df.columns or '股票名称' not in df.columns:
         return df
 
-    result = df.copy()
+    # 只整列替换代码和名称列，浅拷贝即可，不会修改原始数据
+    result = df.copy(deep=False)
+
+    # 在覆盖代码列之前保留原始代码，名称链接直接使用，无需从<a>标签中解析
+    raw_codes = result['股票代码'].astype(str)
+    codes = raw_codes.str.zfill(6)
+    exchanges = pd.Series(np.where(codes.str[0].isin(['6', '9']), 'SH', 'SZ'), index=codes.index)
 
     # 为股票代码添加链接
-    result['股票代码'] = result['股票代码'].apply(
-        lambda x: f'<a href="{EXTERNAL_LINKS["stock"]["同花顺"].format(code=str(x).zfill(6))}" target="_blank">{x}</a>'
-    )
+    result['股票代码'] = _wrap_links(_format_urls(EXTERNAL_LINKS["stock"]["同花顺"], code=codes), raw_codes)
 
     # 为股票名称添加链接
-    for idx, row in result.iterrows():
-        code = str(row['股票代码']).split('>')[1].split('<')[0].zfill(6)  # 提取代码文本
-        prefix = "SH" if str(code).startswith(('6', '9')) else "SZ"
-        result.at[idx, '股票名称'] = f'<a href="{EXTERNAL_LINKS["stock"]["雪球"].format(exchange=prefix, code=code)}" target="_blank">{row["股票名称"]}</a>'
+    result['股票名称'] = _wrap_links(
+        _format_urls(EXTERNAL_LINKS["stock"]["雪球"], exchange=exchanges, code=codes),
+        result['股票名称'].astype(str)
+    )
 
     return result
 
@@ -146,17 +359,21 @@ def add_fund_links(df: pd.DataFrame) -> pd.DataFrame:
     if '基金代码' not in df.columns or '基金简称' not in df.columns:
         return df
 
-    result = df.copy()
+    # 只整列替换代码和名称列，浅拷贝即可，不会修改原始数据
+    result = df.copy(deep=False)
+
+    # 在覆盖代码列之前保留原始代码，简称链接直接使用，无需从<a>标签中解析
+    raw_codes = result['基金代码'].astype(str)
+    codes = raw_codes.str.zfill(6)
 
     # 为基金代码添加链接
-    result['基金代码'] = result['基金代码'].apply(
-        lambda x: f'<a href="{EXTERNAL_LINKS["fund"]["同花顺"].format(code=str(x).zfill(6))}" target="_blank">{x}</a>'
-    )
+    result['基金代码'] = _wrap_links(_format_urls(EXTERNAL_LINKS["fund"]["同花顺"], code=codes), raw_codes)
 
     # 为基金简称添加链接
-    for idx, row in result.iterrows():
-        code = str(row['基金代码']).split('>')[1].split('<')[0].zfill(6)  # 提取代码文本
-        result.at[idx, '基金简称'] = f'<a href="{EXTERNAL_LINKS["fund"]["东方财富"].format(code=code)}" target="_blank">{row["基金简称"]}</a>'
+    result['基金简称'] = _wrap_links(
+        _format_urls(EXTERNAL_LINKS["fund"]["东方财富"], code=codes),
+        result['基金简称'].astype(str)
+    )
 
     return result
 
@@ -171,55 +388,239 @@ def apply_color_style(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: 应用样式后的DataFrame
     """
+    if df.empty:
+        return df.style
 
-    # 定义样式函数
-    def color_values(val, col_name):
-        try:
-            # 处理百分比格式
-            if isinstance(val, str) and '%' in val:
-                val_num = float(val.replace('%', '').strip())
-                if val_num < 0:
-                    return f'color: {TABLE_CONFIG["negative_color"]}'
-                elif col_name == '今年来' and val_num > 0:
-                    return f'color: {TABLE_CONFIG["positive_color"]}'
-            # 处理普通数字
-            elif isinstance(val, (int, float)):
-                if val < 0:
-                    return f'color: {TABLE_CONFIG["negative_color"]}'
-                elif col_name == '今年来' and val > 0:
-                    return f'color: {TABLE_CONFIG["positive_color"]}'
-            # 处理可能是数字的字符串
-            elif isinstance(val, str):
-                try:
-                    val_num = float(val)
-                    if val_num < 0:
-                        return f'color: {TABLE_CONFIG["negative_color"]}'
-                    elif col_name == '今年来' and val_num > 0:
-                        return f'color: {TABLE_CONFIG["positive_color"]}'
-                except:
-                    pass
-        except:
-            pass
+    negative_style = f'color: {TABLE_CONFIG["negative_color"]}'
+    positive_style = f'color: {TABLE_CONFIG["positive_color"]}'
+
+    # 整列计算样式：负值标色，今年来列的正值标色
+    def column_styles(column: pd.Series) -> pd.Series:
+        numbers = _parse_numbers(column).to_numpy()
+        if np.isnan(numbers).all():
+            return pd.Series('', index=column.index)
+        positive = (numbers > 0) if column.name == '今年来' else False
+        styles = np.where(numbers < 0, negative_style, np.where(positive, positive_style, ''))
+        return pd.Series(styles, index=column.index, dtype=object)
+
+    # 应用样式，axis=0时每次传入一列
+    return df.style.apply(column_styles, axis=0)
+
+
+def _parse_numbers(column: pd.Series) -> pd.Series:
+    """
+    将列解析为数值，支持百分比字符串，无法解析的为NaN
+    
+    Args:
+        column: 原始列
+        
+    Returns:
+        pd.Series: 浮点数列
+    """
+    if pd.api.types.is_numeric_dtype(column):
+        return column.astype(float)
+
+    texts = column.astype(str).str.replace('%', '', regex=False).str.strip()
+    return pd.to_numeric(texts, errors='coerce').astype(float)
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """
+    计算DataFrame内容指纹，用于缓存键
+    
+    Args:
+        df: 数据帧
+        
+    Returns:
+        str: 内容指纹，无法计算时返回None（不使用缓存）
+    """
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).values
+    except TypeError:
+        return None
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    digest.update(repr((df.shape, list(df.columns), [str(t) for t in df.dtypes])).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _cache_get(cache: Dict[Any, Any], key: Any) -> Any:
+    """读取缓存，命中的项移到最后，作为最近使用的项最后淘汰"""
+    if key is None:
+        return None
+    with _CACHE_LOCK:
+        value = cache.pop(key, None)
+        if value is not None:
+            cache[key] = value
+    return value
+
+
+def _cache_put(cache: Dict[Any, Any], key: Any, value: Any, max_entries: int) -> None:
+    """写入缓存，超出容量时淘汰最久未使用的项"""
+    if key is None:
+        return
+    with _CACHE_LOCK:
+        cache[key] = value
+        while len(cache) > max_entries:
+            del cache[next(iter(cache))]
+
+
+def _parse_percent(text: str) -> float:
+    """解析单个百分比字符串，无法解析时返回NaN"""
+    try:
+        return float(text.replace('%', ''))
+    except:
+        return np.nan
+
+
+def _build_table_rows(display_df: pd.DataFrame, data_type: str) -> str:
+    """
+    整列构建表格主体的HTML，代替逐行逐单元格拼接
+    
+    Args:
+        display_df: 要显示的DataFrame（已格式化、已排序）
+        data_type: 数据类型，'stock'或'fund'
+        
+    Returns:
+        str: 所有<tr>行拼接后的HTML
+    """
+    if display_df.empty:
         return ''
 
-    # 创建样式函数
-    def apply_styles(df_or_series):
-        if isinstance(df_or_series, pd.Series):
-            # 处理Series对象（单列）
-            col_name = df_or_series.name
-            return pd.Series([color_values(x, col_name) for x in df_or_series], index=df_or_series.index)
+    # 代码和名称列添加链接
+    if data_type == 'stock':
+        display_df = add_stock_links(display_df)
+    elif data_type == 'fund':
+        display_df = add_fund_links(display_df)
+
+    # 一次性转为二维object数组，按位置取列，避免逐列按列名查找和类型转换
+    data = display_df.to_numpy(dtype=object)
+
+    # 正值标色只适用于今年来和收益率列，列宽也只与列名有关，循环前统一计算
+    columns = list(display_df.columns)
+    positive_columns = {col for col in columns if col == '今年来' or '收益率' in col}
+    widths = [_COLUMN_WIDTHS.get(col, _DEFAULT_COLUMN_WIDTH) for col in columns]
+
+    cells = []
+    for col_idx, col_name in enumerate(columns):
+        values = pd.Series(data[:, col_idx], dtype=object)
+        texts = values.astype(str).to_numpy()
+
+        # 百分比值按正负添加颜色样式
+        base_class = f' class="col-{col_name}"'
+        try:
+            is_percent = values.str.contains('%', regex=False, na=False)
+        except AttributeError:
+            is_percent = None  # 列中没有字符串
+        if is_percent is not None and is_percent.any():
+            numbers = pd.Series(np.nan, index=values.index)
+            numbers[is_percent] = pd.to_numeric(
+                values[is_percent].str.replace('%', '', regex=False), errors='coerce'
+            )
+            unparsed = is_percent & numbers.isna()
+            if unparsed.any():
+                numbers[unparsed] = values[unparsed].map(_parse_percent)
+
+            conditions = [numbers < 0]
+            choices = [f' class="col-{col_name} negative-value"']
+            if col_name in positive_columns:
+                conditions.append(numbers > 0)
+                choices.append(f' class="col-{col_name} positive-value"')
+            classes = np.select(conditions, choices, default=base_class).astype(object)
         else:
-            # 处理DataFrame对象（多列）
-            styles = pd.DataFrame('', index=df_or_series.index, columns=df_or_series.columns)
-            for col in df_or_series.columns:
-                styles[col] = df_or_series[col].apply(lambda x: color_values(x, col))
-            return styles
+            # 没有百分比值的列所有单元格样式相同，无需逐个判断
+            classes = base_class
+
+        # 添加单元格，应用列宽样式；在object数组上拼接，省去Series的索引对齐
+        style = f' style="width: {widths[col_idx]}px;">'
+        cells.append('<td' + classes + style + texts + '</td>')
 
-    # 应用样式
-    return df.style.apply(apply_styles)
+    rows = '<tr>' + reduce(operator.add, cells) + '</tr>'
+    return ''.join(rows.tolist())
 
 
-def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool = False) -> None:
+def _select_display_columns(df: pd.DataFrame, data_type: str) -> pd.DataFrame:
+    """
+    精简基金表格列，解决列太多的问题；股票表格保持原样
+    
+    Args:
+        df: 数据帧
+        data_type: 数据类型，'stock'或'fund'
+        
+    Returns:
+        pd.DataFrame: 要显示的列
+    """
+    if data_type != 'fund':
+        return df
+
+    # 定义要保留的列
+    essential_columns = [
+        '序号', '基金代码', '基金简称', '基金类型', '年化收益率', '第1年收益率',
+        '第2年收益率', '第3年收益率', '今年来', '近1年', '近3年', '上市年限'
+    ]
+
+    # 如果有基金经理和基金公司列，也保留
+    if '基金经理' in df.columns:
+        essential_columns.append('基金经理')
+    if '基金公司' in df.columns:
+        essential_columns.append('基金公司')
+
+    # 只保留必要的列
+    available_columns = [col for col in essential_columns if col in df.columns]
+    return df[available_columns]
+
+
+def _display_native_table(df: pd.DataFrame, data_type: str) -> None:
+    """
+    使用Streamlit原生表格显示原始数据，数值列以数值传给前端，由前端格式化、排序和虚拟滚动
+    
+    Args:
+        df: 原始DataFrame（未经format_dataframe处理）
+        data_type: 数据类型，'stock'或'fund'
+    """
+    native_df = df.copy(deep=False)
+    column_config = {}
+    for col in native_df.columns:
+        values = native_df[col]
+        if values.dtype.kind in 'iuf':
+            # 已是数值的列直接使用，配置过格式的按配置显示
+            if col in _NUMBER_FORMATS:
+                column_config[col] = st.column_config.NumberColumn(format=_NUMBER_FORMATS[col])
+            continue
+        if values.dtype.kind != 'O':
+            continue
+
+        texts = values.astype(str)
+        is_percent = texts.str.contains('%', regex=False).any()
+        if col not in _NUMBER_FORMATS and not is_percent:
+            continue
+
+        # 配置过格式的列和百分比列（如第1年收益率、股息率）去掉单引号、百分号和单位后转为数值，前端才能按数值排序
+        native_df[col] = pd.to_numeric(
+            texts.str.replace(r"['%亿]", '', regex=True).str.strip(), errors='coerce'
+        ).astype(float)
+        column_config[col] = st.column_config.NumberColumn(format=_NUMBER_FORMATS.get(col, '%.2f%%'))
+
+    # LinkColumn只能显示URL本身，链接单独成列，代码列保持原样
+    code_column, link_template = (
+        ('股票代码', EXTERNAL_LINKS["stock"]["同花顺"]) if data_type == 'stock'
+        else ('基金代码', EXTERNAL_LINKS["fund"]["同花顺"])
+    )
+    if code_column in native_df.columns:
+        codes = native_df[code_column].astype(str).str.zfill(6)
+        native_df['链接'] = _format_urls(link_template, code=codes)
+        column_config['链接'] = st.column_config.LinkColumn('链接')
+
+    st.dataframe(
+        native_df,
+        height=TABLE_CONFIG['height'],
+        use_container_width=True,
+        hide_index=True,
+        column_config=column_config
+    )
+
+
+def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool = False,
+                  use_native: bool = False) -> None:
     """
     显示带有固定表头的表格，支持通过下拉菜单排序
     
@@ -227,34 +628,33 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
         df: 要显示的DataFrame
         data_type: 数据类型，'stock'或'fund'
         show_title: 是否显示标题和下载按钮，默认为False
+        use_native: 是否使用Streamlit原生表格（前端虚拟滚动、点击表头排序），默认为False使用HTML表格
     """
     if df.empty:
         st.warning("没有找到符合条件的数据，请调整筛选条件。")
         return
 
-    # 格式化数据
-    formatted_df = format_dataframe(df)
-
-    # 精简基金表格列，解决列太多的问题
-    if data_type == 'fund':
-        # 定义要保留的列
-        essential_columns = [
-            '序号', '基金代码', '基金简称', '基金类型', '年化收益率', '第1年收益率',
-            '第2年收益率', '第3年收益率', '今年来', '近1年', '近3年', '上市年限'
-        ]
-
-        # 如果有基金经理和基金公司列，也保留
-        if '基金经理' in formatted_df.columns:
-            essential_columns.append('基金经理')
-        if '基金公司' in formatted_df.columns:
-            essential_columns.append('基金公司')
-
-        # 只保留必要的列
-        available_columns = [col for col in essential_columns if col in formatted_df.columns]
-        display_df = formatted_df[available_columns].copy()
-    else:
-        # 股票表格保持原样
-        display_df = formatted_df.copy()
+    # 创建标题行，包含排序控件（移除标签，优化布局）
+    if show_title:
+        # 如果需要显示标题，则创建标题行 - 减小标题边距
+        st.markdown("""
+        <h3 style="margin-top:0rem; padding-top:0rem; margin-bottom:0rem;">📋 筛选结果</h3>
+        """, unsafe_allow_html=True)
+
+    # 原生表格直接使用原始数值，由前端格式化、排序和滚动，不需要格式化、排序控件和分页
+    if use_native:
+        _display_native_table(_select_display_columns(df, data_type), data_type)
+        return
+
+    # 格式化数据，内容未变化时复用上次结果（调用方只读取，不修改缓存的数据帧）
+    fingerprint = _frame_fingerprint(df)
+    formatted_df = _cache_get(_FORMAT_CACHE, fingerprint)
+    if formatted_df is None:
+        formatted_df = format_dataframe(df)
+        _cache_put(_FORMAT_CACHE, fingerprint, formatted_df, _FORMAT_CACHE_SIZE)
+
+    # 精简基金表格列（后续排序都返回新的数据帧，不会修改缓存的格式化结果）
+    display_df = _select_display_columns(formatted_df, data_type)
 
     # 为每个表格类型创建固定的会话状态键
     # 使用数据类型区分不同表格，避免使用时间戳
@@ -266,13 +666,6 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
         st.session_state[sort_state_key] = None
         st.session_state[sort_dir_state_key] = True
 
-    # 创建标题行，包含排序控件（移除标签，优化布局）
-    if show_title:
-        # 如果需要显示标题，则创建标题行 - 减小标题边距
-        st.markdown("""
-        <h3 style="margin-top:0rem; padding-top:0rem; margin-bottom:0rem;">📋 筛选结果</h3>
-        """, unsafe_allow_html=True)
-
     # 创建排序控件行 - 使用更紧凑的布局
     col1, col2, col3, col4 = st.columns([1, 2, 2, 1])
 
@@ -330,26 +723,8 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
     # 更新排序方向
     st.session_state[sort_dir_state_key] = (sort_direction == "升序")
 
-    # 定义列宽配置
-    column_widths = {
-        '序号': 40,
-        '股票代码': 80,
-        '基金代码': 80,
-        '股票名称': 80,
-        '基金简称': 110,
-        '股息率': 50,
-        '北上持股': 90,
-        '当前ROE': 60,
-        '平均ROE': 60,
-        'PE.扣非': 60,
-        '今年来': 60,
-        '行业': 70
-    }
-
-    # 为未明确定义宽度的列设置默认宽度
-    for col in display_df.columns:
-        if col not in column_widths:
-            column_widths[col] = 70  # 默认宽度
+    # 同一数据和排序条件下生成的CSV和表格HTML相同，以此作为缓存键
+    render_key = (fingerprint, data_type, sort_column, sort_direction) if fingerprint else None
 
     # 应用排序 - 简化逻辑，增强健壮性
     if sort_column != "不排序" and sort_column in display_df.columns:
@@ -362,24 +737,30 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
         st.session_state[sort_dir_state_key] = asc
 
         # 尝试将列转换为数值进行排序
+        sort_keys = display_df.attrs.get('sort_keys', {})
         try:
-            # 检查是否为百分比值 - 更健壮的方式
-            has_percent = False
-            if display_df[col].dtype == object:
-                try:
-                    has_percent = display_df[col].astype(str).str.contains('%').any()
-                except:
-                    has_percent = False
-
-            if has_percent:
-                # 处理百分比值
-                temp_col = col + '_sort'
-                display_df[temp_col] = display_df[col].str.replace('%', '').astype(float)
-                display_df = display_df.sort_values(by=temp_col, ascending=asc)
-                display_df = display_df.drop(columns=[temp_col])
+            if col in sort_keys:
+                # 格式化过的数值列直接按格式化前的数值排序，无需解析格式化后的字符串，空值排在最后
+                display_df = display_df.sort_values(
+                    by=col, ascending=asc, kind='stable', key=lambda _: sort_keys[col]
+                )
             else:
-                # 尝试直接排序
-                display_df = display_df.sort_values(by=col, ascending=asc)
+                # 检查是否为百分比值 - 更健壮的方式
+                has_percent = False
+                if display_df[col].dtype == object:
+                    try:
+                        has_percent = display_df[col].astype(str).str.contains('%').any()
+                    except:
+                        has_percent = False
+
+                if has_percent:
+                    # 处理百分比值，按去掉百分号后的数值排序，无需添加临时列
+                    display_df = display_df.sort_values(
+                        by=col, ascending=asc, key=lambda values: values.str.replace('%', '').astype(float)
+                    )
+                else:
+                    # 尝试直接排序
+                    display_df = display_df.sort_values(by=col, ascending=asc)
         except Exception as e:
             # 如果转换失败，按字符串排序
             try:
@@ -392,11 +773,13 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
     # if True:
     # # 添加下载按钮到第四列
     with col4:
-        # 将DataFrame转换为CSV
-        csv = display_df.to_csv(index=False)
+        # 将DataFrame转换为CSV，使用UTF-8 with BOM，确保Excel正确显示中文；排序切换等重新渲染时复用缓存
+        csv_bytes = _cache_get(_CSV_CACHE, render_key)
+        if csv_bytes is None:
+            csv_bytes = display_df.to_csv(index=False).encode('utf-8-sig')
+            _cache_put(_CSV_CACHE, render_key, csv_bytes, _RENDER_CACHE_SIZE)
 
         # 生成更有意义的文件名
-        from datetime import datetime
         current_time = datetime.now().strftime('%Y%m%d_%H%M')
 
         if data_type == 'stock':
@@ -408,7 +791,7 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
         download_key = f"dl_{data_type}"
         st.download_button(
             label="⬇ 下载筛选结果",
-            data=csv.encode('utf-8-sig'),  # 使用UTF-8 with BOM，确保Excel正确显示中文
+            data=csv_bytes,
             file_name=file_name,
             mime="text/csv",
             key=download_key,
@@ -416,156 +799,60 @@ def display_table(df: pd.DataFrame, data_type: str = 'stock', show_title: bool =
         )
 
     # 添加CSS样式
-    st.markdown(f"""
-    <style>
-    /* 移除页面底部留白 */
-    .main .block-container {{
-        padding-bottom: 100rem;
-        max-width: 85%;
-    }}
-    
-    /* 确保表格容器填充可用空间 */
-    .stApp {{
-        height: 100vh;
-    }}
-    
-    .fixed-table {{
-        width: 100%;
-        border-collapse: collapse;
-        table-layout: fixed;
-        font-size: 16px;  /* 减小字体大小 */
-    }}
-    .fixed-table-container {{
-        height: calc(100vh - 200px); /* 动态计算高度，留出页面其他元素的空间 */
-        min-height: {TABLE_CONFIG['height']}px; /* 最小高度保证 */
-        overflow-x: auto;
-        overflow-y: auto;
-        width: 100%;  /* 确保容器宽度占满 */
-    }}
-    .fixed-table thead {{
-        position: sticky;
-        top: 0;
-        background-color: {TABLE_CONFIG['header_bg_color']};
-        z-index: 100;
-    }}
-    .fixed-table th {{
-        padding: 6px 4px;  /* 减小内边距 */
-        text-align: center;
-        font-weight: bold;
-        border-bottom: 2px solid {TABLE_CONFIG['border_color']};
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-        font-size: 16px;  /* 表头字体大小 */
-    }}
-    .fixed-table td {{
-        padding: 3px 4px;  /* 进一步减小单元格内边距 */
-        border-bottom: 1px solid {TABLE_CONFIG['border_color']};
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-        text-align: center;  /* 居中对齐 */
-        height: 28px;  /* 固定行高，使表格更紧凑 */
-        max-height: 32px;
-    }}
-    
-    /* 优化排序控件的布局 */
-    .stSelectbox, .stRadio {{
-        margin-bottom: 0rem;
-    }}
-    
-    /* 减少Streamlit组件的默认间距 */
-    .element-container {{
-        margin-bottom: 0rem;
-    }}
-    .fixed-table a {{
-        color: {TABLE_CONFIG['link_color']};
-        text-decoration: none;
-    }}
-    .fixed-table a:hover {{
-        text-decoration: underline;
-    }}
-    .positive-value {{
-        color: {TABLE_CONFIG['positive_color']};
-    }}
-    .negative-value {{
-        color: {TABLE_CONFIG['negative_color']};
-    }}
-    </style>
-    """, unsafe_allow_html=True)
-
-    # 手动构建HTML表格，包含原始表头
-    html_parts = ['<div class="fixed-table-container"><table class="fixed-table">']
-
-    # 添加表头
-    html_parts.append('<thead>')
-    html_parts.append('<tr>')
-    for col in display_df.columns:
-        # 为每列添加特定的CSS类，强制应用列宽
-        # 添加当前排序列的标记
-        if sort_column != "不排序" and sort_column == col:
-            sort_icon = " ↑" if (sort_direction == "升序") else " ↓"
-            html_parts.append(
-                f'<th class="col-{col}" style="width: {column_widths.get(col, 70)}px;">{col}{sort_icon}</th>')
-        else:
-            html_parts.append(f'<th class="col-{col}" style="width: {column_widths.get(col, 70)}px;">{col}</th>')
-    html_parts.append('</tr>')
-    html_parts.append('</thead>')
-
-    # 添加表格内容
-    html_parts.append('<tbody>')
-
-    # 遍历数据行
-    for idx, row in display_df.iterrows():
+    st.markdown(_TABLE_STYLE, unsafe_allow_html=True)
+
+    # 结果较多时分页显示，只构建当前页的HTML；排序和下载仍针对全部数据
+    page = 1
+    page_size = TABLE_CONFIG['page_size']
+    if len(display_df) > page_size:
+        page_count = (len(display_df) + page_size - 1) // page_size
+        with col3:
+            page = int(st.number_input(
+                label="页码",
+                min_value=1,
+                max_value=page_count,
+                value=1,
+                step=1,
+                key=f"page_{data_type}",
+                help=f"共{len(display_df)}条，每页{page_size}条，共{page_count}页",
+                label_visibility="collapsed"
+            ))
+    page_df = display_df.iloc[(page - 1) * page_size:page * page_size]
+
+    # 手动构建HTML表格，同一数据、排序条件和页码下直接复用缓存的HTML
+    html_key = render_key + (page,) if render_key else None
+    table_html = _cache_get(_HTML_CACHE, html_key)
+    if table_html is None:
+        html_parts = ['<div class="fixed-table-container"><table class="fixed-table">']
+
+        # 添加表头
+        html_parts.append('<thead>')
         html_parts.append('<tr>')
-
-        # 遍历每一列
-        for col_idx, col_name in enumerate(display_df.columns):
-            value = row[col_name]
-
-            # 特殊处理股票代码和名称列，添加链接
-            if data_type == 'stock':
-                if col_name == '股票代码':
-                    code = str(value).zfill(6)
-                    value = f'<a href="{EXTERNAL_LINKS["stock"]["同花顺"].format(code=code)}" target="_blank">{value}</a>'
-                elif col_name == '股票名称':
-                    code = str(row['股票代码']).zfill(6)
-                    prefix = "SH" if str(code).startswith(('6', '9')) else "SZ"
-                    value = f'<a href="{EXTERNAL_LINKS["stock"]["雪球"].format(exchange=prefix, code=code)}" target="_blank">{value}</a>'
-            elif data_type == 'fund':
-                if col_name == '基金代码':
-                    code = str(value).zfill(6)
-                    value = f'<a href="{EXTERNAL_LINKS["fund"]["同花顺"].format(code=code)}" target="_blank">{value}</a>'
-                elif col_name == '基金简称':
-                    code = str(row['基金代码']).zfill(6)
-                    value = f'<a href="{EXTERNAL_LINKS["fund"]["东方财富"].format(code=code)}" target="_blank">{value}</a>'
-
-            # 添加颜色样式
-            css_class = f' class="col-{col_name}'
-            if isinstance(value, str):
-                if '%' in value:
-                    try:
-                        num_value = float(value.replace('%', ''))
-                        if num_value < 0:
-                            css_class += ' negative-value'
-                        elif (col_name == '今年来' or '收益率' in col_name) and num_value > 0:
-                            css_class += ' positive-value'
-                    except:
-                        pass
-            css_class += '"'
-
-            # 添加单元格，应用列宽样式
-            html_parts.append(f'<td{css_class} style="width: {column_widths.get(col_name, 70)}px;">{value}</td>')
-
+        for col in display_df.columns:
+            # 为每列添加特定的CSS类，强制应用列宽
+            # 添加当前排序列的标记
+            if sort_column != "不排序" and sort_column == col:
+                sort_icon = " ↑" if (sort_direction == "升序") else " ↓"
+                html_parts.append(
+                    f'<th class="col-{col}" style="width: {_COLUMN_WIDTHS.get(col, _DEFAULT_COLUMN_WIDTH)}px;">{col}{sort_icon}</th>')
+            else:
+                html_parts.append(f'<th class="col-{col}" style="width: {_COLUMN_WIDTHS.get(col, _DEFAULT_COLUMN_WIDTH)}px;">{col}</th>')
         html_parts.append('</tr>')
+        html_parts.append('</thead>')
+
+        # 添加表格内容
+        html_parts.append('<tbody>')
+        html_parts.append(_build_table_rows(page_df, data_type))
+        html_parts.append('</tbody>')
+        html_parts.append('</table></div>')
 
-    html_parts.append('</tbody>')
-    html_parts.append('</table></div>')
+        table_html = ''.join(html_parts)
+        _cache_put(_HTML_CACHE, html_key, table_html, _RENDER_CACHE_SIZE)
 
     # 不再需要JavaScript排序代码
 
     # 显示表格
-    st.markdown(''.join(html_parts), unsafe_allow_html=True)
+    st.markdown(table_html, unsafe_allow_html=True)
 
 
 def display_statistics(df: pd.DataFrame, data_type: str = 'stock') -> None:
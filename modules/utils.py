@@ -4,14 +4,37 @@
 """
 
 import os
+import copy
 import json
+import logging
 import streamlit as st
 import pandas as pd
 import re
 from datetime import datetime
 import hashlib
+import hmac
+from functools import lru_cache
 from modules.config import USER_DATA_PATH, DATA_PATH
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# orjson序列化选项：2空格缩进，允许非字符串键和numpy数值，与json.dump的行为保持一致
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if orjson is not None else 0
+)
+
+# 示例用户的密码哈希（admin123 / user123 的SHA-256），首次运行时写入users.json
+_DEFAULT_USER_PASSWORDS = {
+    "admin": ("240be518fabd2724ddb6f04eeb1da5967448d7e831c08c8fa822809f74c720a9", "admin"),
+    "user": ("e606e38b0d8c19b24cf0ee3808183162ea7cd63ff7912dbb22b5e803286b4446", "user"),
+}
+
 def load_css():
     """加载自定义CSS样式"""
     st.markdown("""
@@ -105,6 +128,61 @@ def format_number(number, is_percentage=False, decimal_places=2):
     except (ValueError, TypeError):
         return str(number)
 
+def _load_json(file_path):
+    """
+    读取JSON文件，安装了orjson时使用orjson解析
+    
+    Args:
+        file_path: 文件路径
+        
+    Returns:
+        解析后的数据
+    """
+    # 按字节读取，orjson写入的是未转义的UTF-8，文本模式在非UTF-8系统编码（如cp936）下会解码失败
+    with open(file_path, "rb") as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _dump_json(file_path, data):
+    """
+    以2空格缩进写入JSON文件，安装了orjson时使用orjson序列化
+    先写入临时文件再替换原文件，写入中途失败不会破坏原有内容
+    
+    Args:
+        file_path: 文件路径
+        data: 要写入的数据
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    else:
+        content = json.dumps(data, indent=2).encode()
+    
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@lru_cache(maxsize=128)
+def _load_prefs(user_file, mtime_ns):
+    """
+    读取并缓存用户偏好文件，文件修改时间作为缓存键的一部分，文件被改写后自动失效
+    
+    Args:
+        user_file: 偏好文件路径
+        mtime_ns: 文件修改时间（纳秒）
+        
+    Returns:
+        dict: 用户偏好设置（缓存共享对象，调用方不可修改）
+    """
+    return _load_json(user_file)
+
 def user_auth(username, password):
     """
     简单的用户认证
@@ -118,29 +196,20 @@ def user_auth(username, password):
     
     # 创建示例用户数据（如果文件不存在）
     if not os.path.exists(user_file):
+        created_at = datetime.now().isoformat()
         default_users = {
-            "admin": {
-                "password": hashlib.sha256("admin123".encode()).hexdigest(),
-                "role": "admin",
-                "created_at": datetime.now().isoformat()
-            },
-            "user": {
-                "password": hashlib.sha256("user123".encode()).hexdigest(),
-                "role": "user",
-                "created_at": datetime.now().isoformat()
-            }
+            name: {"password": password_hash, "role": role, "created_at": created_at}
+            for name, (password_hash, role) in _DEFAULT_USER_PASSWORDS.items()
         }
         
         os.makedirs(os.path.dirname(user_file), exist_ok=True)
-        with open(user_file, "w") as f:
-            json.dump(default_users, f, indent=2)
+        _dump_json(user_file, default_users)
     
     # 读取用户数据
     try:
-        with open(user_file, "r") as f:
-            users = json.load(f)
+        users = _load_json(user_file)
             
-        if username in users and users[username]["password"] == hashed:
+        if username in users and hmac.compare_digest(users[username]["password"], hashed):
             return True
     except Exception as e:
         st.error(f"认证错误: {e}")
@@ -171,11 +240,14 @@ def save_user_preferences(user_id, category, name, data):
     prefs = {}
     if os.path.exists(user_file):
         try:
-            with open(user_file, "r") as f:
-                prefs = json.load(f)
+            prefs = _load_json(user_file)
         except:
             prefs = {}
     
+    # 内容与已保存的一致时无需重写文件
+    if category in prefs and name in prefs[category] and prefs[category][name] == data:
+        return True
+    
     # 确保类别存在
     if category not in prefs:
         prefs[category] = {}
@@ -185,8 +257,8 @@ def save_user_preferences(user_id, category, name, data):
     
     # 写回文件
     try:
-        with open(user_file, "w") as f:
-            json.dump(prefs, f, indent=2)
+        _dump_json(user_file, prefs)
+        _load_prefs.cache_clear()
         return True
     except Exception as e:
         st.error(f"保存设置失败: {e}")
@@ -210,21 +282,22 @@ def get_user_preferences(user_id, category=None):
     user_file = os.path.join(USER_DATA_PATH, "preferences", f"{user_id}.json")
     
     # 如果文件不存在，返回空字典
-    if not os.path.exists(user_file):
+    try:
+        mtime_ns = os.stat(user_file).st_mtime_ns
+    except FileNotFoundError:
         return {}
     
-    # 读取配置
+    # 读取配置，文件未变化时直接使用缓存，返回副本避免调用方修改缓存内容
     try:
-        with open(user_file, "r") as f:
-            prefs = json.load(f)
+        prefs = _load_prefs(user_file, mtime_ns)
         
         # 如果指定了类别，只返回该类别的设置
         if category and category in prefs:
-            return prefs[category]
+            return copy.deepcopy(prefs[category])
         elif category:
             return {}
         
-        return prefs
+        return copy.deepcopy(prefs)
     except Exception as e:
         st.error(f"读取设置失败: {e}")
         return {}
@@ -330,7 +403,7 @@ def safe_read_csv(file_path, sep=',', encoding='utf-8'):
             return pd.read_csv(file_path, encoding=encoding)
         return pd.DataFrame()
     except Exception as e:
-        print(f"读取文件 {file_path} 失败: {e}")
+        logger.warning("读取文件 %s 失败: %s", file_path, e)
         return pd.DataFrame()
 
 